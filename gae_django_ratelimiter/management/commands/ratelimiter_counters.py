@@ -0,0 +1,120 @@
+import sys
+import argparse
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+from google.appengine.api import apiproxy_stub_map
+
+from ...ratelimiter import RateLimiter
+
+
+def _minutes(value):
+    # Keep the same formatting as the configured minutes, e.g. 2 not 2.0,
+    # otherwise the generated keys will not match
+    try:
+        minutes = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError('Invalid minutes: {}'.format(value))
+    return int(minutes) if minutes.is_integer() else minutes
+
+
+class Command(BaseCommand):
+    help = (
+        'Inspect or reset the rate limit counters for a list of clients. '
+        'Each line in the file is an IP, optionally followed by a tab and '
+        'the user agent, or a cache key if --keys is used.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'file', help='File with one client per line, "-" for stdin')
+        parser.add_argument(
+            '--keys', action='store_true', default=False,
+            help='Lines are cache keys instead of IPs/UAs')
+        parser.add_argument(
+            '--reset', action='store_true', default=False,
+            help='Delete the counters instead of listing them')
+        parser.add_argument(
+            '--class', dest='limiter_class',
+            default='{}.{}'.format(
+                RateLimiter.__module__, RateLimiter.__name__),
+            help='Dotted path to the rate limiter (or middleware) class '
+                 'used to build the cache keys. Default "%(default)s"')
+        parser.add_argument(
+            '--prefix',
+            help='Cache key prefix. Defaults to the class prefix')
+        parser.add_argument(
+            '--minutes', type=_minutes,
+            help='Interval in minutes. Defaults to the class minutes')
+        parser.add_argument(
+            '--batch-size', type=int,
+            help='Keys per memcache call. Defaults to the class batch_size')
+        parser.add_argument(
+            '--remote', metavar='HOST',
+            help='Use the memcache of a deployed app through remote_api, '
+                 'e.g. myapp.appspot.com')
+        parser.add_argument(
+            '--remote-path', default='/_ah/remote_api',
+            help='URL path of the remote_api handler. '
+                 'Default "/_ah/remote_api"')
+
+    def read_lines(self, filename):
+        if filename == '-':
+            return sys.stdin.read().splitlines()
+        try:
+            with open(filename) as f:
+                return f.read().splitlines()
+        except IOError as e:
+            raise CommandError(e)
+
+    def setup_memcache(self, options):
+        if options['remote']:
+            from google.appengine.ext.remote_api import remote_api_stub
+            remote_api_stub.ConfigureRemoteApiForOAuth(
+                options['remote'], options['remote_path'])
+        if not apiproxy_stub_map.apiproxy.GetStub('memcache'):
+            # Outside of the GAE runtime nothing provides memcache
+            raise CommandError(
+                'No memcache API proxy found. Use --remote HOST to connect '
+                'to a deployed app through remote_api.')
+
+    def get_limiter(self, options):
+        try:
+            limiter_class = import_string(options['limiter_class'])
+        except ImportError as e:
+            raise CommandError(e)
+        limiter_options = {}
+        for name in ('prefix', 'minutes', 'batch_size'):
+            if options[name] is not None:
+                limiter_options[name] = options[name]
+        return limiter_class(**limiter_options)
+
+    def handle(self, *args, **options):
+        rl = self.get_limiter(options)
+        if rl.batch_size < 1:
+            raise CommandError('Invalid batch size')
+
+        lines = [line for line in self.read_lines(options['file'])
+                 if line.strip()]
+        if options['keys']:
+            keys = [line.strip() for line in lines]
+        else:
+            clients = []
+            for line in lines:
+                ip, _, user_agent = line.partition('\t')
+                clients.append((ip.strip(), user_agent))
+            keys = rl.client_keys(clients)
+
+        self.setup_memcache(options)
+
+        if options['reset']:
+            if not rl.reset_counts(keys):
+                raise CommandError('Failed to reset some counters')
+            self.stdout.write(
+                'Reset counters for {} client(s)'.format(len(keys)))
+            return
+
+        counts = rl.cached_counts(keys)
+        for key in keys:
+            if key in counts:
+                self.stdout.write('{}\t{}'.format(key, counts[key]))
+        self.stdout.write('{} of {} client(s) have counters'.format(
+            len(counts), len(keys)))
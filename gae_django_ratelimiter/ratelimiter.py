@@ -4,6 +4,7 @@ import functools
 from hashlib import md5
 import re
 from django.http import HttpResponse
+from django.utils import six
 from django.core.urlresolvers import resolve
 from google.appengine.api import memcache, users
 
@@ -67,6 +68,10 @@ class RateLimiter(object):
     # https://cloud.google.com/appengine/docs/standard/python/taskqueue/push/creating-handlers#writing_a_push_task_request_handler
     gae_internal_ips = ('0.1.0.1', '0.1.0.2')
 
+    # Max number of keys per memcache get_multi/delete_multi call
+    # when inspecting or resetting counters in bulk
+    batch_size = 500
+
     # Basic bogon ip ranges
     bogon_ip_re = re.compile(
         r'10\.|127\.|169\.254\.|192\.0\.0\.|192\.168\.|'
@@ -141,20 +146,51 @@ class RateLimiter(object):
         """Override this method if you want to log incidents"""
         return HttpResponseThrottled()
 
-    def current_key(self, request):
-        """Override this to use a different cache key"""
+    def client_key(self, ip, user_agent=''):
+        """
+        Cache key for a client identified by its IP and UA.
+        Override this to use a different cache key, it is also used by
+        the bulk counter methods and the ratelimiter_counters command
+        (pass your class with --class).
+        """
         # Google's memcache key len is max 250 bytes
         # https://cloud.google.com/appengine/docs/standard/python/memcache/
         m = md5()
         # Use a basic hash of the UA
-        m.update(request.META.get('HTTP_USER_AGENT', ''))
+        m.update(user_agent)
         return '{}_{}_{}_{}'.format(
             self.prefix,
-            self.ip(request),
+            ip,
             m.hexdigest(),
             self.minutes,
         )
 
+    def current_key(self, request):
+        """
+        Cache key for the request. Override client_key instead to use
+        a different cache key, otherwise the bulk counter methods will
+        not find the counters.
+        """
+        return self.client_key(
+            self.ip(request), request.META.get('HTTP_USER_AGENT', ''))
+
+    def client_keys(self, clients):
+        """Cache keys for a list of IPs or (ip, user_agent) tuples"""
+        keys = []
+        for client in clients:
+            if isinstance(client, six.string_types):
+                client = (client, )
+            keys.append(self.client_key(*client))
+        return keys
+
+    def _batches(self, keys):
+        if self.batch_size < 1:
+            raise ValueError(
+                'Invalid batch_size: {}'.format(self.batch_size))
+        keys = list(keys)
+        for i in range(0, len(keys), self.batch_size):
+            yield keys[i:i + self.batch_size]
+
     def expire_after(self):
         """Used for setting the memcache expiry"""
         return (self.minutes) * 60
@@ -162,6 +198,24 @@ class RateLimiter(object):
     def cached_count(self, key):
         return memcache.get(key, 0) or 0
 
+    def cached_counts(self, keys):
+        """Returns a dict of key: count for the keys that are cached"""
+        counts = {}
+        for batch in self._batches(keys):
+            counts.update(memcache.get_multi(batch))
+        return counts
+
+    def reset_counts(self, keys):
+        """
+        Deletes the counters for keys.
+        Returns False if any of the memcache deletes failed.
+        """
+        success = True
+        for batch in self._batches(keys):
+            if not memcache.delete_multi(batch):
+                success = False
+        return success
+
     def cache_incr(self, key):
         # add first, to ensure the key exists
         added = memcache.add(key, 0, time=self.expire_after())
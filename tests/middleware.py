@@ -39,3 +39,10 @@ class IncludeAuthRateLimiterMiddleware(RateLimiterMiddleware):
 class ExcludeAuthAdminRateLimiterMiddleware(RateLimiterMiddleware):
     exclude_authenticated = False
     exclude_admins = True
+
+
+class CustomKeyRateLimiterMiddleware(RateLimiterMiddleware):
+    prefix = 'custom'
+
+    def client_key(self, ip, user_agent=''):
+        return '{}_{}'.format(self.prefix, ip)
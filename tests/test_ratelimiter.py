@@ -3,6 +3,8 @@ import sys
 import unittest
 import copy
 import time
+import tempfile
+import os
 from hashlib import md5
 try:
     import unittest.mock as compat_mock
@@ -10,6 +12,8 @@ except ImportError:
     import mock as compat_mock
 
 from django.test import Client
+from django.core.management import call_command, CommandError
+from django.utils.six import StringIO
 from django.core.exceptions import ImproperlyConfigured
 try:    # pragma: no cover
     from google.appengine.ext import testbed
@@ -40,6 +44,7 @@ except ImproperlyConfigured:
         'django.contrib.auth',
         'django.contrib.contenttypes',
         'tests',
+        'gae_django_ratelimiter',
     ]
     from gae_django_ratelimiter import RateLimiterMiddleware
     from gae_django_ratelimiter.ratelimiter import RateLimiter
@@ -92,6 +97,118 @@ class RateLimiterTests(unittest.TestCase):
             '{}_{}_{}_{}'.format('xyz', rl.ip(req), m.hexdigest(), rl.minutes),
             rl.current_key(req))
 
+    def test_bulk_counters(self):
+        from google.appengine.api import memcache
+
+        rl = RateLimiter(prefix='xyz', minutes=1, batch_size=2)
+        clients = [
+            ('1.1.1.{}'.format(i), 'Mozilla/5.0 RATELIMITER')
+            for i in range(5)]
+        keys = rl.client_keys(clients)
+        self.assertEqual(5, len(set(keys)))
+        self.assertEqual(
+            [rl.client_key('1.1.1.1')], rl.client_keys(['1.1.1.1']))
+
+        req = copy.deepcopy(self.request)
+        req.META['REMOTE_ADDR'] = clients[0][0]
+        self.assertEqual(keys[0], rl.current_key(req))
+
+        for i, key in enumerate(keys[:3]):
+            memcache.set(key, i + 1)
+
+        with compat_mock.patch.object(
+                memcache, 'get_multi', wraps=memcache.get_multi) as get_multi:
+            self.assertEqual(
+                {keys[0]: 1, keys[1]: 2, keys[2]: 3},
+                rl.cached_counts(keys))
+            self.assertEqual(3, get_multi.call_count)
+
+        self.assertTrue(rl.reset_counts(keys[:2]))
+        self.assertEqual({keys[2]: 3}, rl.cached_counts(keys))
+
+        for batch_size in (0, -1):
+            rl.batch_size = batch_size
+            with self.assertRaises(ValueError):
+                rl.cached_counts(keys)
+            with self.assertRaises(ValueError):
+                rl.reset_counts(keys)
+
+    def test_counters_command(self):
+        from google.appengine.api import memcache
+
+        rl = RateLimiter()
+        ua = 'Mozilla/5.0 RATELIMITER'
+        key = rl.client_key('1.1.1.1', ua)
+        memcache.set(key, 5)
+
+        fd, filename = tempfile.mkstemp()
+        self.addCleanup(os.remove, filename)
+        with os.fdopen(fd, 'w') as f:
+            f.write('1.1.1.1\t{}\n2.2.2.2\n'.format(ua))
+
+        out = StringIO()
+        call_command('ratelimiter_counters', filename, stdout=out)
+        self.assertIn('{}\t5'.format(key), out.getvalue())
+        self.assertIn('1 of 2 client(s) have counters', out.getvalue())
+        self.assertEqual(5, rl.cached_count(key))
+
+        out = StringIO()
+        call_command('ratelimiter_counters', filename, reset=True, stdout=out)
+        self.assertIn('Reset counters for 2 client(s)', out.getvalue())
+        self.assertEqual(0, rl.cached_count(key))
+
+        memcache.set(key, 5)
+        with open(filename, 'w') as f:
+            f.write('{}\n'.format(key))
+        call_command(
+            'ratelimiter_counters', filename, keys=True, reset=True,
+            stdout=StringIO())
+        self.assertEqual(0, rl.cached_count(key))
+
+        with self.assertRaises(CommandError):
+            call_command(
+                'ratelimiter_counters', filename + '.missing',
+                stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command(
+                'ratelimiter_counters', filename, batch_size=0,
+                stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command(
+                'ratelimiter_counters', filename, limiter_class='nope.Nope',
+                stdout=StringIO())
+        with compat_mock.patch(
+                'google.appengine.api.apiproxy_stub_map.apiproxy.GetStub',
+                return_value=None):
+            with self.assertRaises(CommandError):
+                call_command(
+                    'ratelimiter_counters', filename, stdout=StringIO())
+
+    def test_counters_command_class(self):
+        from google.appengine.api import memcache
+        from middleware import CustomKeyRateLimiterMiddleware
+
+        key = CustomKeyRateLimiterMiddleware().client_key('1.1.1.1')
+        memcache.set(key, 5)
+
+        fd, filename = tempfile.mkstemp()
+        self.addCleanup(os.remove, filename)
+        with os.fdopen(fd, 'w') as f:
+            f.write('1.1.1.1\n')
+
+        out = StringIO()
+        call_command(
+            'ratelimiter_counters', filename,
+            limiter_class='middleware.CustomKeyRateLimiterMiddleware',
+            stdout=out)
+        self.assertIn('{}\t5'.format(key), out.getvalue())
+
+        call_command(
+            'ratelimiter_counters', filename, reset=True,
+            limiter_class='middleware.CustomKeyRateLimiterMiddleware',
+            stdout=StringIO())
+        self.assertEqual(0, memcache.get(key, 0))
+
     def test_disabled(self):
         from middleware import DisabledRateLimiterMiddleware
         settings.MIDDLEWARE_CLASSES = (